@@ -0,0 +1,69 @@
+"""
+Parity of the v2 indicator scan with and without the optional Hyperscan database
+"""
+
+import random
+import unicodedata
+import unittest
+
+import numpy as np
+
+import transcript_analyzer_v2 as v2
+
+# Hyperscan folds neither of these to 'i', Python's re does
+CASE_FOLD_DIFFERENCES = {'İ', 'ı'}
+
+# Scripts whose digits Python's \d matches but Hyperscan's does not
+DIGIT_DIFFERENCE_SCRIPTS = (
+    'ADLAM', 'AHOM', 'BHAIKSUKI', 'DIVES AKURU', 'GUNJALA GONDI', 'HANIFI ROHINGYA',
+    'MASARAM GONDI', 'NEWA', 'NYIAKENG PUACHUE HMONG', 'SEGMENTED', 'TANGSA', 'WANCHO',
+)
+
+TOKENS = (
+    "Let's explore examine calculate Your task mission assignment is : Step 3 12 . ** bold "
+    "=== Page 7 === \\[ x \\] Consider the this a Now let's we'll you'll Excellent Great ! "
+    "You yes no ok okay i think i don't confused help not sure ? can you what if why how "
+    "wait but so um uh actually café über Ωmega ß"
+).split(' ')
+SEPARATORS = [' ', '  ', '\n', '\t', '\r\n', '\x0b', '\x1c', '\x1f', '\x85', '\xa0',
+              '᠎', ' ', '　', '']
+
+
+@unittest.skipIf(v2.hyperscan is None, "hyperscan is not installed")
+class IndicatorEngineParityTest(unittest.TestCase):
+    """The Hyperscan scan must give re's hits, apart from the documented differences"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.hs = v2.AdvancedTranscriptAnalyzer()
+        cls.re = v2.AdvancedTranscriptAnalyzer()
+        cls.re.indicator_db = None
+
+    def differs(self, text):
+        return not np.array_equal(self.hs._indicator_hits(text), self.re._indicator_hits(text))
+
+    def test_database_compiles(self):
+        self.assertIsNotNone(self.hs.indicator_db)
+
+    def test_engines_agree_on_fuzzed_text(self):
+        rng = random.Random(0)
+        for _ in range(5000):
+            text = ''.join(rng.choice(TOKENS) + rng.choice(SEPARATORS)
+                           for _ in range(rng.randint(1, 12)))
+            self.assertFalse(self.differs(text), repr(text))
+
+    def test_case_fold_differences_are_pinned(self):
+        differing = {chr(cp) for cp in range(0x10000)
+                     if not 0xD800 <= cp < 0xE000 and self.differs(chr(cp) + ' think')}
+        self.assertEqual(differing, CASE_FOLD_DIFFERENCES)
+
+    def test_digit_differences_are_pinned(self):
+        digits = [chr(cp) for cp in range(0x110000) if chr(cp).isdecimal()]
+        differing = {c for c in digits if self.differs(f'Step {c}:')}
+        expected = {c for c in digits
+                    if unicodedata.name(c).rsplit(' DIGIT', 1)[0] in DIGIT_DIFFERENCE_SCRIPTS}
+        self.assertEqual(differing, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,16 +6,74 @@ Parses conversation transcripts to identify speakers and calculate engagement ra
 
 import os
 import re
+import functools
 import csv
 import json
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Iterable, Optional, TextIO
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Content cues checked once per scored segment
+_MATH_RE = re.compile(r'[\\$]\s*[a-zA-Z_]+\s*[\\$=]')
+_INSTRUCTION_RE = re.compile(r'\b(?:calculate|derive|analyze|consider|examine)\b', re.IGNORECASE)
+
+def _union(patterns: List[str], flags: int = 0) -> 're.Pattern':
+    """Join patterns into one alternation of non-capturing groups"""
+    return re.compile('|'.join(f'(?:{p})' for p in patterns), flags)
+
+def _compile_each(patterns: List[str], flags: int = 0) -> List['re.Pattern']:
+    """Compile every pattern in a list with the same flags"""
+    return [re.compile(p, flags) for p in patterns]
+
+def _is_word(text: str) -> bool:
+    """True if text is a non-empty run of word characters (regex \\w+)"""
+    return text.replace('_', 'a').isalnum()
+
+# Characters escaped in report snippets, applied in one str.translate pass
+_HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# Speaker markers all end at the line's first colon, so lines are
+# dispatched on the text before it; only the "<Name> Assistant:" and
+# "<Type> Specialist:" forms need a regex
+_INSTRUCTOR_SUFFIX_KEYWORDS = ('assistant', 'specialist')
+_INSTRUCTOR_ROLE_RE = re.compile(r'^\s*(?:\w+\s+Assistant|[A-Z][a-z]+\s+Specialist):', re.IGNORECASE)
+
+@functools.lru_cache(maxsize=8192)
+def _classify_line(line: str) -> Tuple[Optional[str], str]:
+    """Detect a leading speaker marker, returning (speaker, text after marker)
+    
+    Cached because transcripts repeat many lines verbatim (blank prompts,
+    boilerplate, short answers).
+    """
+    stripped = line.lstrip()
+    head, sep, rest = stripped.partition(':')
+    if not sep:
+        return None, line
+    low = head.lower()
+    
+    # Student markers: A:, Student:, Student_Entity_X:, student...:
+    if low == 'a' or (low.startswith('student') and (low == 'student' or _is_word(low[7:]))):
+        return 'Student', rest.strip()
+    
+    # Instructor markers: Claud-ius:, Prof. Name:
+    if low == 'claud-ius' or (
+            low.startswith('prof.') and head[5:6].isspace() and _is_word(head[5:].lstrip())):
+        return 'AI', rest.strip()
+    
+    # Name Assistant:, Type Specialist:
+    if low.endswith(_INSTRUCTOR_SUFFIX_KEYWORDS) and _INSTRUCTOR_ROLE_RE.match(stripped):
+        return 'AI', rest.strip()
+    
+    return None, line
 
 @dataclass
 class TextSegment:
     """Represents a segment of text with speaker classification"""
+    # Explicit slots (dataclass(slots=True) needs 3.10): one instance per segment
+    __slots__ = ('text', 'speaker', 'word_count', 'confidence', 'line_start', 'line_end')
+    
     text: str
     speaker: str  # 'AI' or 'Student'
     word_count: int
@@ -26,6 +84,9 @@ class TextSegment:
 @dataclass
 class TranscriptAnalysis:
     """Analysis results for a single transcript"""
+    __slots__ = ('filename', 'segments', 'ai_words', 'student_words', 'total_words',
+                 'student_ratio', 'ai_ratio')
+    
     filename: str
     segments: List[TextSegment]
     ai_words: int
@@ -37,79 +98,109 @@ class TranscriptAnalysis:
 class TranscriptParser:
     """Parses transcripts to identify AI vs Student utterances"""
     
-    def __init__(self):
-        # Patterns that strongly indicate AI responses
-        self.ai_patterns = [
-            r'^\s*\*[^*]+\*\s*$',  # Text in asterisks
-            r'=== Page \d+ ===',    # Page markers
-            r'^\s*\*\*[^*]+\*\*',   # Bold headers
-            r'^\s*###?\s+\*\*',     # Markdown headers
-            r'^\s*Step\s+\d+:',     # Step instructions
-            r'Your\s+(task|response|turn)',  # Direct instructions
-            r'\\\[.*?\\\]',         # LaTeX math
-            r'\\begin\{.*?\}',      # LaTeX environments
-            r'^\s*\d+\.\s+\*\*',    # Numbered sections
-            r'Brain-Computer Interface Specialist',
-            r'Neural Specialist',
-            r'Quantum Computing Instructor',
-        ]
-        
-        # Patterns that strongly indicate student responses
-        self.student_patterns = [
-            r'^\s*A:\s*',                    # Explicit answer marker
-            r'^\s*Student:\s*',              # Student: marker
-            r'^\s*Student_Entity_[A-Z]:\s*', # Student_Entity_X: marker
-            r'^\s*[Ss]tudent\w*:\s*',        # Any student variant
-        ]
-        
-        # Patterns for AI/instructor responses
-        self.instructor_patterns = [
-            r'^\s*Prof\.\s+\w+:\s*',         # Prof. Name:
-            r'^\s*\w+\s+Assistant:\s*',      # Name Assistant:
-            r'^\s*Claud-ius:\s*',           # Specific AI names
-            r'^\s*[A-Z][a-z]+\s+Specialist:\s*', # Type Specialist:
-        ]
-        
-        # Patterns indicating corruption/noise
-        self.noise_patterns = [
-            r'[A-Z]{4,}',           # Long sequences of capitals
-            r'[#$%&*]{3,}',         # Symbol clusters
-            r'\b[A-Z]+[#$%&*]+[A-Z]*\b',  # Mixed caps and symbols
-        ]
+    # Patterns that strongly indicate AI responses
+    AI_PATTERNS = [
+        r'^\s*\*[^*]+\*\s*$',  # Text in asterisks
+        r'=== Page \d+ ===',    # Page markers
+        r'^\s*\*\*[^*]+\*\*',   # Bold headers
+        r'^\s*###?\s+\*\*',     # Markdown headers
+        r'^\s*Step\s+\d+:',     # Step instructions
+        r'Your\s+(task|response|turn)',  # Direct instructions
+        r'\\\[.*?\\\]',         # LaTeX math
+        r'\\begin\{.*?\}',      # LaTeX environments
+        r'^\s*\d+\.\s+\*\*',    # Numbered sections
+        r'Brain-Computer Interface Specialist',
+        r'Neural Specialist',
+        r'Quantum Computing Instructor',
+    ]
+    
+    # Patterns that strongly indicate student responses
+    STUDENT_PATTERNS = [
+        r'^\s*A:\s*',                    # Explicit answer marker
+        r'^\s*Student:\s*',              # Student: marker
+        r'^\s*Student_Entity_[A-Z]:\s*', # Student_Entity_X: marker
+        r'^\s*[Ss]tudent\w*:\s*',        # Any student variant
+    ]
+    
+    # Patterns for AI/instructor responses
+    INSTRUCTOR_PATTERNS = [
+        r'^\s*Prof\.\s+\w+:\s*',         # Prof. Name:
+        r'^\s*\w+\s+Assistant:\s*',      # Name Assistant:
+        r'^\s*Claud-ius:\s*',           # Specific AI names
+        r'^\s*[A-Z][a-z]+\s+Specialist:\s*', # Type Specialist:
+    ]
+    
+    # Patterns indicating corruption/noise
+    NOISE_PATTERNS = [
+        r'[A-Z]{4,}',           # Long sequences of capitals
+        r'[#$%&*]{3,}',         # Symbol clusters
+        r'\b[A-Z]+[#$%&*]+[A-Z]*\b',  # Mixed caps and symbols
+    ]
+    
+    # Compiled once when the class is created, not per instance. Each
+    # category has its individual patterns plus one alternation so
+    # scoring scans each text once; noise checks are case-sensitive
+    AI_RES = _compile_each(AI_PATTERNS, re.IGNORECASE | re.MULTILINE)
+    STUDENT_RES = _compile_each(STUDENT_PATTERNS, re.IGNORECASE | re.MULTILINE)
+    INSTRUCTOR_RES = _compile_each(INSTRUCTOR_PATTERNS, re.IGNORECASE | re.MULTILINE)
+    NOISE_RES = _compile_each(NOISE_PATTERNS)
+    AI_RE = _union(AI_PATTERNS, re.IGNORECASE | re.MULTILINE)
+    STUDENT_RE = _union(STUDENT_PATTERNS, re.IGNORECASE | re.MULTILINE)
+    INSTRUCTOR_RE = _union(INSTRUCTOR_PATTERNS, re.IGNORECASE | re.MULTILINE)
+    NOISE_RE = _union(NOISE_PATTERNS)
+    
+    # Markup stripped before counting words (LaTeX math, LaTeX
+    # commands, markdown emphasis and headers) in a single pass
+    STRIP_RE = re.compile(r'\\\[.*?\\\]|\\[a-zA-Z]+\{[^}]*\}|\*+|#+')
+    WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+    
+    # Unmarked segments are scored on the whole lines within this many
+    # leading characters. The cues are local (anchored lines, short
+    # literals, keywords), so the window captures them while bounding regex
+    # time on long preambles; the length heuristic still uses the full
+    # segment's word count.
+    SCORING_WINDOW = 4000
 
     def count_words(self, text: str) -> int:
         """Count words in text, excluding markup and symbols"""
-        # Remove LaTeX and markdown
-        clean_text = re.sub(r'\\\[.*?\\\]', '', text)
-        clean_text = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', '', clean_text)
-        clean_text = re.sub(r'\*+', '', clean_text)
-        clean_text = re.sub(r'#+', '', clean_text)
+        # Remove LaTeX and markdown; every markup form needs one of these
+        # characters, so plain prose skips the regex pass entirely
+        clean_text = text
+        if '*' in text or '#' in text or '\\' in text:
+            clean_text = self.STRIP_RE.sub('', text)
         
         # Count actual words
-        words = re.findall(r'\b[a-zA-Z]+\b', clean_text)
+        words = self.WORD_RE.findall(clean_text)
         return len(words)
 
-    def calculate_ai_probability(self, text: str) -> float:
-        """Calculate probability that text is from AI (0-1)"""
-        score = 0.5  # Start neutral
+    def _scoring_text(self, text: str) -> str:
+        """Leading SCORING_WINDOW characters of text, cut back to a line end"""
+        if len(text) <= self.SCORING_WINDOW:
+            return text
+        # A line cut short can match a line-anchored cue (e.g. '*foo*' out
+        # of '*foo*bar') that the whole line does not, so only whole lines
+        # are kept; a single overlong first line is kept whole
+        cut = text.rfind('\n', 0, self.SCORING_WINDOW + 1)
+        if cut < 0:
+            cut = text.find('\n')
+        return text if cut < 0 else text[:cut]
+
+    def calculate_ai_probability(self, text: str, word_count: Optional[int] = None) -> float:
+        """Calculate probability that text is from AI (0-1)
         
-        # Check for AI indicators
-        for pattern in self.ai_patterns:
-            if re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
-                score += 0.2
+        Pass word_count when the caller has already counted the text.
+        """
+        score = 0.5  # Start neutral
         
-        # Check for instructor patterns
-        for pattern in self.instructor_patterns:
-            if re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
-                score += 0.3
+        # Negative cues go first: once they are applied the score can only
+        # grow, so it is safe to stop as soon as it saturates at 1.0
         
-        # Check for student indicators  
-        for pattern in self.student_patterns:
-            if re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
-                score -= 0.4
+        # Check for student indicators (each pattern counts once)
+        score -= 0.4 * self._count_patterns(self.STUDENT_RE, self.STUDENT_RES, text)
         
         # Length heuristic - AI responses tend to be longer
-        word_count = self.count_words(text)
+        if word_count is None:
+            word_count = self.count_words(text)
         if word_count > 100:
             score += 0.1
         elif word_count > 50:
@@ -117,74 +208,96 @@ class TranscriptParser:
         elif word_count < 10:
             score -= 0.1
         
+        # Check for instructor patterns
+        score += 0.3 * self._count_patterns(self.INSTRUCTOR_RE, self.INSTRUCTOR_RES, text)
+        if score >= 1.0:
+            return 1.0
+        
+        # Check for AI indicators
+        score += 0.2 * self._count_patterns(self.AI_RE, self.AI_RES, text)
+        if score >= 1.0:
+            return 1.0
+        
         # Check for mathematical content
-        if re.search(r'[\\$]\s*[a-zA-Z_]+\s*[\\$=]', text):
+        if _MATH_RE.search(text):
             score += 0.15
         
         # Check for instructional language
-        if re.search(r'\b(calculate|derive|analyze|consider|examine)\b', text, re.IGNORECASE):
+        if _INSTRUCTION_RE.search(text):
             score += 0.1
+        if score >= 1.0:
+            return 1.0
             
         # Check for noise/corruption
-        for pattern in self.noise_patterns:
-            if re.search(pattern, text):
-                score += 0.05  # Corrupted text slightly more likely to be AI
+        # Corrupted text slightly more likely to be AI
+        score += 0.05 * self._count_patterns(self.NOISE_RE, self.NOISE_RES, text)
         
         return max(0.0, min(1.0, score))
 
-    def segment_transcript(self, content: str) -> List[TextSegment]:
-        """Split transcript into segments and classify speakers"""
-        lines = content.split('\n')
+    @staticmethod
+    def _count_patterns(union_re: 're.Pattern', patterns: List['re.Pattern'], text: str) -> int:
+        """Count how many of patterns occur in text, using their union as a prefilter"""
+        # One scan settles the common no-hit case; on a hit, no pattern can
+        # match before the union's leftmost match, so resume from there
+        first = union_re.search(text)
+        if first is None:
+            return 0
+        start = first.start()
+        return sum(1 for pattern in patterns if pattern.search(text, start))
+
+    def segment_transcript(self, lines: Iterable[str]) -> List[TextSegment]:
+        """Split transcript into segments and classify speakers
+        
+        lines can be any iterable of lines, such as an open file, so the
+        transcript never has to be held in memory twice. A plain string
+        is split into lines first.
+        """
+        if isinstance(lines, str):
+            lines = lines.split('\n')
         segments = []
         current_segment = []
         current_speaker = None
         current_start = 0
+        # Words are counted line by line as the segment grows, so a
+        # segment is only joined once, when it is kept. LaTeX commands
+        # (\cmd{...}) can span lines, so a segment containing a backslash
+        # is recounted as a whole to match count_words on the joined text.
+        current_words = 0
+        current_has_latex = False
         
-        # Combined pattern for all speaker markers
-        all_student_patterns = '|'.join(self.student_patterns)
-        all_instructor_patterns = '|'.join(self.instructor_patterns)
-        
-        for i, line in enumerate(lines):
+        i, raw = 0, ''
+        for i, raw in enumerate(lines):
+            line = raw.rstrip('\n')
+            
             # Skip empty lines
             if not line.strip():
                 if current_segment:
                     current_segment.append(line)
                 continue
             
-            detected_speaker = None
-            clean_text = line
-            
-            # Check for student markers
-            if re.match(all_student_patterns, line, re.IGNORECASE):
-                detected_speaker = 'Student'
-                # Extract text after the marker
-                for pattern in self.student_patterns:
-                    clean_text = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
-                    if clean_text != line.strip():
-                        break
-            
-            # Check for instructor markers  
-            elif re.match(all_instructor_patterns, line, re.IGNORECASE):
-                detected_speaker = 'AI'
-                # Extract text after the marker
-                for pattern in self.instructor_patterns:
-                    clean_text = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
-                    if clean_text != line.strip():
-                        break
+            # Speaker markers start with a word character, so page markers
+            # ("=== Page N ===") and *italic*/**bold** prompt lines skip
+            # detection outright and stay out of the line cache
+            if _is_word(line.lstrip()[0]):
+                detected_speaker, clean_text = _classify_line(line)
+            else:
+                detected_speaker, clean_text = None, line
             
             # If we found a speaker marker or speaker changed
             if detected_speaker and detected_speaker != current_speaker:
                 # Finish previous segment if exists
                 if current_segment:
-                    text = '\n'.join(current_segment)
-                    word_count = self.count_words(text)
+                    word_count = current_words
+                    if current_has_latex:
+                        word_count = self.count_words('\n'.join(current_segment))
                     if word_count > 0:
+                        text = '\n'.join(current_segment)
                         if current_speaker:
                             speaker = current_speaker
                             confidence = 0.9
                         else:
                             # Use probability-based classification
-                            ai_prob = self.calculate_ai_probability(text)
+                            ai_prob = self.calculate_ai_probability(self._scoring_text(text), word_count)
                             speaker = 'AI' if ai_prob > 0.5 else 'Student'
                             confidence = abs(ai_prob - 0.5) * 2
                         
@@ -199,23 +312,36 @@ class TranscriptParser:
                 
                 # Start new segment
                 current_segment = [clean_text] if clean_text else []
+                current_words = self.count_words(clean_text) if clean_text else 0
+                current_has_latex = '\\' in clean_text
                 current_speaker = detected_speaker
                 current_start = i
             else:
                 # Continue current segment
                 current_segment.append(line)
+                current_words += self.count_words(line)
+                current_has_latex = current_has_latex or '\\' in line
+        
+        # A trailing newline ends one more (empty) line
+        last_line = i
+        if raw.endswith('\n'):
+            last_line += 1
+            if current_segment:
+                current_segment.append('')
         
         # Handle final segment
         if current_segment:
-            text = '\n'.join(current_segment)
-            word_count = self.count_words(text)
+            word_count = current_words
+            if current_has_latex:
+                word_count = self.count_words('\n'.join(current_segment))
             if word_count > 0:
+                text = '\n'.join(current_segment)
                 if current_speaker:
                     speaker = current_speaker
                     confidence = 0.9
                 else:
                     # Use probability-based classification
-                    ai_prob = self.calculate_ai_probability(text)
+                    ai_prob = self.calculate_ai_probability(self._scoring_text(text), word_count)
                     speaker = 'AI' if ai_prob > 0.5 else 'Student'
                     confidence = abs(ai_prob - 0.5) * 2
                 
@@ -225,7 +351,7 @@ class TranscriptParser:
                     word_count=word_count,
                     confidence=confidence,
                     line_start=current_start,
-                    line_end=len(lines)-1
+                    line_end=last_line
                 ))
         
         return segments
@@ -233,12 +359,15 @@ class TranscriptParser:
     def analyze_transcript(self, filepath: str) -> TranscriptAnalysis:
         """Analyze a single transcript file"""
         with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-        
-        segments = self.segment_transcript(content)
+            segments = self.segment_transcript(f)
         
-        ai_words = sum(seg.word_count for seg in segments if seg.speaker == 'AI')
-        student_words = sum(seg.word_count for seg in segments if seg.speaker == 'Student')
+        # Tally both speakers in a single pass over the segments
+        ai_words = student_words = 0
+        for seg in segments:
+            if seg.speaker == 'AI':
+                ai_words += seg.word_count
+            elif seg.speaker == 'Student':
+                student_words += seg.word_count
         total_words = ai_words + student_words
         
         student_ratio = student_words / total_words if total_words > 0 else 0
@@ -259,7 +388,7 @@ class HTMLVisualizer:
     
     def generate_transcript_html(self, analysis: TranscriptAnalysis) -> str:
         """Generate HTML for a single transcript with color coding"""
-        html = f"""
+        parts = [f"""
         <div class="transcript" id="{analysis.filename}">
             <h2>{analysis.filename}</h2>
             <div class="stats">
@@ -268,37 +397,45 @@ class HTMLVisualizer:
                 <span class="stat total-stat">Total: {analysis.total_words} words</span>
             </div>
             <div class="content">
-        """
+        """]
         
         for segment in analysis.segments:
             confidence_class = "high-confidence" if segment.confidence > 0.7 else "low-confidence"
             speaker_class = "ai-segment" if segment.speaker == 'AI' else "student-segment"
             
-            html += f"""
+            parts.append(f"""
                 <div class="segment {speaker_class} {confidence_class}" 
                      title="Speaker: {segment.speaker}, Confidence: {segment.confidence:.2f}, Words: {segment.word_count}">
                     <div class="segment-label">{segment.speaker} ({segment.word_count} words)</div>
                     <div class="segment-text">{self._escape_html(segment.text[:200])}{'...' if len(segment.text) > 200 else ''}</div>
                 </div>
-            """
+            """)
         
-        html += """
+        parts.append("""
             </div>
         </div>
-        """
-        return html
+        """)
+        return ''.join(parts)
     
     def _escape_html(self, text: str) -> str:
         """Escape HTML characters"""
-        return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        return text.translate(_HTML_ESCAPE_TABLE)
     
-    def generate_full_html(self, analyses: List[TranscriptAnalysis]) -> str:
-        """Generate complete HTML report"""
+    def generate_full_html(self, analyses: List[TranscriptAnalysis], out: Optional[TextIO] = None) -> Optional[str]:
+        """Generate complete HTML report
+        
+        If out is given, the report is written to it piece by piece and
+        None is returned; otherwise the HTML is returned as a string.
+        """
+        parts = []
+        emit = out.write if out is not None else parts.append
+        
         # Calculate summary statistics
         total_transcripts = len(analyses)
         avg_student_ratio = sum(a.student_ratio for a in analyses) / total_transcripts if total_transcripts > 0 else 0
+        sorted_analyses = sorted(analyses, key=lambda x: x.student_ratio, reverse=True)
         
-        html = f"""
+        emit(f"""
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -372,42 +509,55 @@ class HTMLVisualizer:
     
     <div class="navigation">
         <h3>Transcripts</h3>
-        {self._generate_nav_links(analyses)}
+        {self._generate_nav_links(sorted_analyses)}
     </div>
-"""
+""")
         
         # Add individual transcript analyses
-        for analysis in sorted(analyses, key=lambda x: x.student_ratio, reverse=True):
-            html += self.generate_transcript_html(analysis)
+        for analysis in sorted_analyses:
+            emit(self.generate_transcript_html(analysis))
         
-        html += """
+        emit("""
 </body>
 </html>
-        """
-        return html
-    
-    def _generate_nav_links(self, analyses: List[TranscriptAnalysis]) -> str:
-        """Generate navigation links for transcripts"""
-        links = ""
-        for analysis in sorted(analyses, key=lambda x: x.student_ratio, reverse=True):
-            links += f'<a href="#{analysis.filename}" class="nav-item">{analysis.filename} ({analysis.student_ratio:.1%})</a>\n'
-        return links
+        """)
+        return ''.join(parts) if out is None else None
+    
+    def _generate_nav_links(self, sorted_analyses: List[TranscriptAnalysis]) -> str:
+        """Generate navigation links for transcripts, already sorted by student ratio"""
+        return ''.join(
+            f'<a href="#{analysis.filename}" class="nav-item">{analysis.filename} ({analysis.student_ratio:.1%})</a>\n'
+            for analysis in sorted_analyses
+        )
 
 def export_csv(analyses: List[TranscriptAnalysis], filepath: str):
     """Export analysis results to CSV"""
-    with open(filepath, 'w', newline='') as csvfile:
+    with open(filepath, 'w', newline='', buffering=1 << 16) as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(['Filename', 'Total_Words', 'AI_Words', 'Student_Words', 'Student_Ratio', 'AI_Ratio'])
-        
-        for analysis in analyses:
-            writer.writerow([
+        writer.writerows(
+            (
                 analysis.filename,
                 analysis.total_words,
                 analysis.ai_words,
                 analysis.student_words,
                 f"{analysis.student_ratio:.3f}",
                 f"{analysis.ai_ratio:.3f}"
-            ])
+            )
+            for analysis in analyses
+        )
+
+# Parser for the current worker process, built once by _init_worker
+_worker_parser: Optional[TranscriptParser] = None
+
+def _init_worker():
+    """Create the per-process parser used by _analyze_one"""
+    global _worker_parser
+    _worker_parser = TranscriptParser()
+
+def _analyze_one(filepath: str) -> TranscriptAnalysis:
+    """Analyze one transcript inside a worker process"""
+    return _worker_parser.analyze_transcript(filepath)
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze AI-Student transcripts')
@@ -418,26 +568,35 @@ def main():
     
     args = parser.parse_args()
     
-    # Initialize analyzer
-    transcript_parser = TranscriptParser()
     visualizer = HTMLVisualizer()
     
-    # Find and analyze transcript files
+    # Find transcript files
     input_path = Path(args.input_dir)
-    analyses = []
     
     print(f"Scanning {input_path} for transcript files...")
     
-    for ext in args.extensions:
-        for file_path in input_path.rglob(f"*{ext}"):
-            if ext == '.txt':
-                print(f"Analyzing {file_path.name}...")
-                try:
-                    analysis = transcript_parser.analyze_transcript(str(file_path))
-                    analyses.append(analysis)
-                    print(f"  → AI: {analysis.ai_words} words, Student: {analysis.student_words} words, Ratio: {analysis.student_ratio:.1%}")
-                except Exception as e:
-                    print(f"  → Error analyzing {file_path.name}: {e}")
+    # Walk the tree once and filter by suffix; only .txt files are analyzed
+    suffixes = tuple(ext for ext in args.extensions if ext == '.txt')
+    files = [Path(dirpath) / name
+             for dirpath, _, names in os.walk(input_path)
+             for name in names if name.endswith(suffixes)]
+    
+    # Files are independent, so analyze them in parallel; keep discovery
+    # order in the results so reports are stable between runs
+    results = {}
+    with ProcessPoolExecutor(initializer=_init_worker) as executor:
+        futures = {executor.submit(_analyze_one, str(file_path)): i for i, file_path in enumerate(files)}
+        for future in as_completed(futures):
+            index = futures[future]
+            file_path = files[index]
+            print(f"Analyzed {file_path.name}")
+            try:
+                analysis = future.result()
+                results[index] = analysis
+                print(f"  → AI: {analysis.ai_words} words, Student: {analysis.student_words} words, Ratio: {analysis.student_ratio:.1%}")
+            except Exception as e:
+                print(f"  → Error analyzing {file_path.name}: {e}")
+    analyses = [results[i] for i in sorted(results)]
     
     if not analyses:
         print("No transcript files found!")
@@ -445,9 +604,8 @@ def main():
     
     # Generate outputs
     print(f"\nGenerating HTML report: {args.output_html}")
-    html_content = visualizer.generate_full_html(analyses)
     with open(args.output_html, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        visualizer.generate_full_html(analyses, f)
     
     print(f"Generating CSV report: {args.output_csv}")
     export_csv(analyses, args.output_csv)
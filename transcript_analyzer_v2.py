@@ -5,9 +5,7 @@
 #     "streamlit",
 #     "pandas",
 #     "plotly",
-#     "textstat",
 #     "numpy",
-#     "scikit-learn",
 # ]
 # ///
 """
@@ -20,20 +18,61 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import textstat
 import numpy as np
 import re
+import io
+import csv
 import json
+import hashlib
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from typing import List, Dict, Tuple, Optional
-import tempfile
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
 import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-@dataclass
+try:
+    import hyperscan
+except ImportError:  # optional: plain re is used when it is not installed
+    hyperscan = None
+
+# Result objects are created per segment, so drop their per-instance
+# __dict__ where dataclasses support it (Python 3.10+)
+SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Layout of the feature vectors returned by extract_features
+FEATURE_NAMES = (
+    'word_count', 'char_count', 'sentence_count', 'avg_word_length',
+    'flesch_reading_ease', 'flesch_kincaid_grade', 'question_count', 'question_ratio',
+    'has_math', 'has_code', 'equation_count', 'caps_ratio',
+    'exclamation_count', 'comma_count', 'semicolon_count', 'formality_score',
+    'instruction_score', 'step_pattern', 'bullet_pattern', 'uncertainty_score', 'casual_score',
+)
+(WORD_COUNT, CHAR_COUNT, SENTENCE_COUNT, AVG_WORD_LENGTH,
+ FLESCH_READING_EASE, FLESCH_KINCAID_GRADE, QUESTION_COUNT, QUESTION_RATIO,
+ HAS_MATH, HAS_CODE, EQUATION_COUNT, CAPS_RATIO,
+ EXCLAMATION_COUNT, COMMA_COUNT, SEMICOLON_COUNT, FORMALITY_SCORE,
+ INSTRUCTION_SCORE, STEP_PATTERN, BULLET_PATTERN, UNCERTAINTY_SCORE, CASUAL_SCORE) = range(len(FEATURE_NAMES))
+
+# Feature scoring rules as (feature, direction, threshold, weight): a rule
+# adds its weight when the feature is above (+1) or below (-1) the threshold
+SCORE_RULES = [
+    (WORD_COUNT, 1, 100, 0.1),
+    (WORD_COUNT, -1, 20, -0.1),
+    (INSTRUCTION_SCORE, 1, 0.02, 0.15),
+    (UNCERTAINTY_SCORE, 1, 0.02, -0.15),
+    (CASUAL_SCORE, 1, 0.02, -0.15),
+    (HAS_MATH, 1, 0, 0.1),
+    (FORMALITY_SCORE, 1, 0.01, 0.1),
+    (QUESTION_RATIO, 1, 0.3, -0.1),
+    (FLESCH_KINCAID_GRADE, 1, 12, 0.05),
+    (FLESCH_KINCAID_GRADE, -1, 8, -0.05),
+]
+
+# Feature vectors memoized per analyzer
+FEATURE_CACHE_SIZE = 4096
+
+@dataclass(**SLOTS)
 class TextSegment:
     """Enhanced text segment with rich features"""
     text: str
@@ -50,9 +89,11 @@ class TextSegment:
     formality_score: float
     start_line: int
     end_line: int
-    features: Dict[str, float]
+    # Indexed as FEATURE_NAMES; None for blank text. Derived from text, so
+    # left out of equality (arrays have no truth value)
+    features: Optional[np.ndarray] = field(compare=False)
 
-@dataclass
+@dataclass(**SLOTS)
 class TranscriptAnalysis:
     """Complete transcript analysis with metadata"""
     filename: str
@@ -64,12 +105,26 @@ class TranscriptAnalysis:
     confidence_score: float
     parsing_method: str
     quality_flags: List[str]
+    # Per-segment columns (structure of arrays) backing the aggregates above;
+    # derived from the segments, so left out of equality (arrays have no truth value)
+    segment_word_counts: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    segment_confidences: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    segment_is_student: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
 
 class AdvancedTranscriptAnalyzer:
     """Multi-approach transcript analyzer with ML-like features"""
     
     def __init__(self):
         self.setup_patterns()
+        # Short utterances ("yes", "ok") and boilerplate lines repeat, so
+        # feature vectors are memoized per analyzer. Keyed on a digest of
+        # the text, so the cache never keeps segment texts alive
+        self.feature_cache: Dict[bytes, Optional[np.ndarray]] = {}
+        # Scoring rules as arrays, so all rules are applied as one dot product
+        self.rule_features = np.array([rule[0] for rule in SCORE_RULES])
+        self.rule_directions = np.array([rule[1] for rule in SCORE_RULES], dtype=np.float64)
+        self.rule_thresholds = np.array([rule[1] * rule[2] for rule in SCORE_RULES], dtype=np.float64)
+        self.rule_weights = np.array([rule[3] for rule in SCORE_RULES], dtype=np.float64)
         
     def setup_patterns(self):
         """Initialize all detection patterns"""
@@ -112,116 +167,240 @@ class AdvancedTranscriptAnalyzer:
             r'\b(?:can you|could you|what if|why|how)\b',
             r'^(?:wait|but|so|um|uh|actually)',
         ]
+        
+        # Compiled once; the unions test a whole pattern group in one pass
+        flags = re.IGNORECASE | re.MULTILINE
+        self.student_marker_re = self._union(self.explicit_student_markers, flags)
+        self.ai_marker_re = self._union(self.explicit_ai_markers, flags)
+        self.ai_indicator_re = self._union(self.ai_indicators, flags)
+        self.student_indicator_re = self._union(self.student_indicators, flags)
+        self.ai_indicator_res = [re.compile(p, flags) for p in self.ai_indicators]
+        self.student_indicator_res = [re.compile(p, flags) for p in self.student_indicators]
+        # Markers for scanning a whole transcript at once, matched from the
+        # newline before the marker line: the literal prefix lets the engine
+        # skip from line to line. \s and [^*] are kept from crossing
+        # newlines so each match stays on its line, and the shared leading
+        # whitespace is hoisted. Student markers come first, so they win
+        line_bound = lambda p: p.replace(r'^\s*', '', 1).replace(r'\s', r'[^\S\n]').replace('[^*]', r'[^*\n]')
+        self.line_marker_re = re.compile(
+            r'\n[^\S\n]*(?:(?P<student>' + '|'.join(f'(?:{line_bound(p)})' for p in self.explicit_student_markers) + ')|'
+            '(?P<ai>' + '|'.join(f'(?:{line_bound(p)})' for p in self.explicit_ai_markers) + '))',
+            re.IGNORECASE
+        )
+        self.non_space_re = re.compile(r'\S')
+        self.parsing_marker_re = re.compile(r'^\s*(?:Student|AI|Prof|Assistant):', flags)
+        
+        # Feature patterns
+        self.sentence_end_re = re.compile(r'[.!?]+')
+        self.word_re = re.compile(r'\b\w+\b')
+        self.math_re = re.compile(r'[\\$]\s*[a-zA-Z_]+|[=<>]+|\d+\s*[+\-*/]\s*\d+')
+        self.code_re = re.compile(r'\b(?:function|def|class|import|return)\b|[{}()[\]];')
+        self.equation_re = re.compile(r'\\[.*?\\]|[a-z]\s*=\s*[^=]')
+        self.caps_re = re.compile(r'\b[A-Z]+\b')
+        self.formal_re = re.compile(r'\b(?:furthermore|moreover|however|therefore|consequently|thus|hence)\b', re.IGNORECASE)
+        self.instruction_re = re.compile(r'\b(?:calculate|derive|analyze|examine|consider|determine)\b', re.IGNORECASE)
+        self.step_re = re.compile(r'Step\s+\d+')
+        self.bullet_re = re.compile(r'^\s*[-*]\s', re.MULTILINE)
+        self.uncertainty_re = re.compile(r'\b(?:maybe|perhaps|i think|not sure|confused|don\'t understand)\b', re.IGNORECASE)
+        self.casual_re = re.compile(r'\b(?:yeah|ok|wow|cool|awesome|wait|um|uh)\b', re.IGNORECASE)
+        self.vowel_group_re = re.compile(r'[aeiouy]+', re.IGNORECASE)
+        # One weight per indicator, AI then student, so the indicator score
+        # is a dot product with the vector of patterns that matched
+        self.indicator_weights = np.array([0.15] * len(self.ai_indicators) +
+                                          [-0.20] * len(self.student_indicators))
+        self.indicator_db, self.indicator_extra = self._build_indicator_db()
+
+    def __getstate__(self):
+        """Pickle without the Hyperscan database, which cannot be pickled"""
+        state = self.__dict__.copy()
+        state['indicator_db'] = None
+        return state
+
+    def __setstate__(self, state):
+        """Restore a pickled analyzer, recompiling its Hyperscan database"""
+        self.__dict__.update(state)
+        self.indicator_db, self.indicator_extra = self._build_indicator_db()
+
+    @staticmethod
+    def _union(patterns: List[str], flags: int = 0) -> re.Pattern:
+        """Compile a list of patterns into a single alternation"""
+        return re.compile('|'.join(f'(?:{p})' for p in patterns), flags)
+
+    def _build_indicator_db(self):
+        """Compile the AI and student indicators into one Hyperscan database"""
+        if hyperscan is None:
+            return None, []
+        
+        # Hyperscan has no Unicode \b, so word-boundary patterns stay on re.
+        # Its \s is Unicode White_Space, which differs from Python's (no
+        # \x1c-\x1f, but U+180E), so Python's whitespace set is spelled out.
+        # Left as is: it does not fold İ/ı to i, and its \d lacks the digits
+        # of some newer scripts (Adlam, Wancho, ...), so text with those can
+        # score differently; tests/test_indicator_engines.py pins the set
+        space = r'[\t-\r\x1c-\x20\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}]'
+        expressions, ids, extra = [], [], []
+        for i, pattern in enumerate(self.ai_indicator_res + self.student_indicator_res):
+            if r'\b' in pattern.pattern:
+                extra.append((i, pattern))
+            else:
+                expressions.append(pattern.pattern.replace(r'\s', space).encode('utf-8'))
+                ids.append(i)
+        flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_MULTILINE |
+                 hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+        try:
+            db = hyperscan.Database()
+            db.compile(expressions=expressions, ids=ids,
+                       elements=len(expressions), flags=[flags] * len(expressions))
+        except hyperscan.error:
+            return None, []
+        return db, extra
+
+    def _indicator_hits(self, text: str) -> np.ndarray:
+        """0/1 vector of which AI and student indicator patterns match"""
+        hits = np.zeros(len(self.indicator_weights))
+        if self.indicator_db is None:
+            self._mark_patterns(self.ai_indicator_re, self.ai_indicator_res, text, hits, 0)
+            self._mark_patterns(self.student_indicator_re, self.student_indicator_res, text,
+                                hits, len(self.ai_indicator_res))
+            return hits
+        
+        def on_match(pattern_id, start, end, flags, context):
+            hits[pattern_id] = 1
+        
+        # SINGLEMATCH reports each pattern at most once per scan
+        self.indicator_db.scan(text.encode('utf-8'), match_event_handler=on_match)
+        for i, pattern in self.indicator_extra:
+            if pattern.search(text):
+                hits[i] = 1
+        return hits
 
-    def extract_features(self, text: str) -> Dict[str, float]:
+    @staticmethod
+    def _mark_patterns(union_re: re.Pattern, patterns: List[re.Pattern], text: str,
+                       hits: np.ndarray, offset: int):
+        """Mark which patterns match, scanning the union once first"""
+        first = union_re.search(text)
+        if not first:
+            return
+        # No pattern can match earlier than the union did
+        start = first.start()
+        for i, pattern in enumerate(patterns, offset):
+            if pattern.search(text, start):
+                hits[i] = 1
+
+    def _readability(self, text: str, n_words: int, n_sentences: int) -> Tuple[float, float]:
+        """Flesch reading ease and Flesch-Kincaid grade in one syllable pass"""
+        # Syllables are vowel groups per word, less a silent final 'e',
+        # and at least one
+        n_syllables = 0
+        for word in text.split():
+            syllables = len(self.vowel_group_re.findall(word))
+            if syllables > 1 and word[-1] in 'eE':
+                syllables -= 1
+            n_syllables += syllables or 1
+        words_per_sentence = n_words / n_sentences
+        syllables_per_word = n_syllables / n_words
+        reading_ease = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+        return reading_ease, grade
+
+    def extract_features(self, text: str) -> Optional[np.ndarray]:
+        """Extract linguistic and statistical features from text, memoized"""
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        if key in self.feature_cache:
+            return self.feature_cache[key]
+        
+        features = self._compute_features(text)
+        if len(self.feature_cache) >= FEATURE_CACHE_SIZE:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self.feature_cache[next(iter(self.feature_cache))]
+        self.feature_cache[key] = features
+        return features
+
+    def _compute_features(self, text: str) -> Optional[np.ndarray]:
         """Extract linguistic and statistical features from text"""
         if not text.strip():
-            return {}
-            
-        features = {}
+            return None
         
         # Basic metrics
-        features['word_count'] = len(text.split())
-        features['char_count'] = len(text)
-        features['sentence_count'] = max(1, len(re.findall(r'[.!?]+', text)))
-        features['avg_word_length'] = np.mean([len(word) for word in re.findall(r'\b\w+\b', text)]) if text else 0
+        word_count = len(text.split())
+        sentence_count = max(1, len(self.sentence_end_re.findall(text)))
+        tokens = self.word_re.findall(text)
+        # Text with no word tokens (e.g. "???") keeps the NaN np.mean gave
+        avg_word_length = sum(map(len, tokens)) / len(tokens) if tokens else float('nan')
         
         # Reading level
-        try:
-            features['flesch_reading_ease'] = textstat.flesch_reading_ease(text)
-            features['flesch_kincaid_grade'] = textstat.flesch_kincaid_grade(text)
-        except:
-            features['flesch_reading_ease'] = 50
-            features['flesch_kincaid_grade'] = 8
+        reading_ease, grade = self._readability(text, word_count, sentence_count)
         
         # Question patterns
-        features['question_count'] = len(re.findall(r'\?', text))
-        features['question_ratio'] = features['question_count'] / max(1, features['sentence_count'])
-        
-        # Technical content
-        features['has_math'] = 1.0 if re.search(r'[\\$]\s*[a-zA-Z_]+|[=<>]+|\d+\s*[+\-*/]\s*\d+', text) else 0.0
-        features['has_code'] = 1.0 if re.search(r'\b(?:function|def|class|import|return)\b|[{}()[\]];', text) else 0.0
-        features['equation_count'] = len(re.findall(r'\\[.*?\\]|[a-z]\s*=\s*[^=]', text))
-        
-        # Capitalization patterns
-        caps_words = re.findall(r'\b[A-Z]+\b', text)
-        features['caps_ratio'] = len(caps_words) / max(1, features['word_count'])
-        
-        # Punctuation
-        features['exclamation_count'] = len(re.findall(r'!', text))
-        features['comma_count'] = len(re.findall(r',', text))
-        features['semicolon_count'] = len(re.findall(r';', text))
-        
-        # Formality indicators
-        formal_words = len(re.findall(r'\b(?:furthermore|moreover|however|therefore|consequently|thus|hence)\b', text, re.IGNORECASE))
-        features['formality_score'] = formal_words / max(1, features['word_count'])
-        
-        # AI-specific patterns
-        features['instruction_score'] = len(re.findall(r'\b(?:calculate|derive|analyze|examine|consider|determine)\b', text, re.IGNORECASE)) / max(1, features['word_count'])
-        features['step_pattern'] = 1.0 if re.search(r'Step\s+\d+', text) else 0.0
-        features['bullet_pattern'] = len(re.findall(r'^\s*[-*]\s', text, re.MULTILINE)) / max(1, features['sentence_count'])
-        
-        # Student-specific patterns  
-        features['uncertainty_score'] = len(re.findall(r'\b(?:maybe|perhaps|i think|not sure|confused|don\'t understand)\b', text, re.IGNORECASE)) / max(1, features['word_count'])
-        features['casual_score'] = len(re.findall(r'\b(?:yeah|ok|wow|cool|awesome|wait|um|uh)\b', text, re.IGNORECASE)) / max(1, features['word_count'])
-        
+        question_count = text.count('?')
+        
+        features = np.array([
+            word_count,
+            len(text),
+            sentence_count,
+            avg_word_length,
+            reading_ease,
+            grade,
+            question_count,
+            question_count / sentence_count,
+            # Technical content
+            1.0 if self.math_re.search(text) else 0.0,
+            1.0 if self.code_re.search(text) else 0.0,
+            len(self.equation_re.findall(text)),
+            # Capitalization patterns
+            len(self.caps_re.findall(text)) / word_count,
+            # Punctuation
+            text.count('!'),
+            text.count(','),
+            text.count(';'),
+            # Formality indicators
+            len(self.formal_re.findall(text)) / word_count,
+            # AI-specific patterns
+            len(self.instruction_re.findall(text)) / word_count,
+            1.0 if self.step_re.search(text) else 0.0,
+            len(self.bullet_re.findall(text)) / sentence_count,
+            # Student-specific patterns
+            len(self.uncertainty_re.findall(text)) / word_count,
+            len(self.casual_re.findall(text)) / word_count,
+        ], dtype=np.float64)
+        # Cached vectors are shared between segments, so keep them read-only
+        features.flags.writeable = False
         return features
 
-    def calculate_speaker_probability(self, text: str, features: Dict[str, float]) -> Tuple[str, float]:
+    def _explicit_speaker(self, text: str) -> Optional[str]:
+        """Speaker named by an explicit marker anywhere in the text, if any"""
+        if self.ai_marker_re.search(text):
+            return 'AI'
+                
+        if self.student_marker_re.search(text):
+            return 'Student'
+        return None
+
+    def _indicator_score(self, text: str) -> float:
+        """Score from the content indicators; each matching one counts once"""
+        return float(self.indicator_weights @ self._indicator_hits(text))
+
+    def _feature_score(self, features: np.ndarray) -> float:
+        """Sum the weights of the scoring rules a feature vector triggers"""
+        activations = features[self.rule_features] * self.rule_directions > self.rule_thresholds
+        return float(activations @ self.rule_weights)
+
+    def _ai_score(self, text: str, features: Optional[np.ndarray]) -> float:
+        """Heuristic AI score; positive leans AI, negative leans Student"""
+        ai_score = self._indicator_score(text)
+        if features is not None:
+            ai_score += self._feature_score(features)
+        return ai_score
+
+    def calculate_speaker_probability(self, text: str, features: Optional[np.ndarray]) -> Tuple[str, float]:
         """Calculate probability of speaker being AI vs Student using multiple heuristics"""
-        ai_score = 0.0
-        
         # Check explicit markers first
-        for pattern in self.explicit_ai_markers:
-            if re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
-                return 'AI', 0.95
-                
-        for pattern in self.explicit_student_markers:
-            if re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
-                return 'Student', 0.95
-        
-        # Content-based scoring
-        for pattern in self.ai_indicators:
-            if re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
-                ai_score += 0.15
-                
-        for pattern in self.student_indicators:
-            if re.search(pattern, text, re.IGNORECASE | re.MULTILINE):
-                ai_score -= 0.20
-        
-        # Feature-based scoring
-        if 'word_count' in features:
-            if features['word_count'] > 100:
-                ai_score += 0.1
-            elif features['word_count'] < 20:
-                ai_score -= 0.1
-                
-        if 'instruction_score' in features and features['instruction_score'] > 0.02:
-            ai_score += 0.15
-            
-        if 'uncertainty_score' in features and features['uncertainty_score'] > 0.02:
-            ai_score -= 0.15
-            
-        if 'casual_score' in features and features['casual_score'] > 0.02:
-            ai_score -= 0.15
-            
-        if 'has_math' in features and features['has_math']:
-            ai_score += 0.1
-            
-        if 'formality_score' in features and features['formality_score'] > 0.01:
-            ai_score += 0.1
-            
-        if 'question_ratio' in features and features['question_ratio'] > 0.3:
-            ai_score -= 0.1
-            
-        if 'flesch_kincaid_grade' in features:
-            if features['flesch_kincaid_grade'] > 12:
-                ai_score += 0.05
-            elif features['flesch_kincaid_grade'] < 8:
-                ai_score -= 0.05
+        explicit_speaker = self._explicit_speaker(text)
+        if explicit_speaker:
+            return explicit_speaker, 0.95
         
         # Convert to probability
-        ai_prob = 1 / (1 + np.exp(-ai_score))  # Sigmoid
+        ai_prob = float(1 / (1 + np.exp(-self._ai_score(text, features))))  # Sigmoid
         
         if ai_prob > 0.5:
             return 'AI', ai_prob
@@ -230,64 +409,72 @@ class AdvancedTranscriptAnalyzer:
 
     def smart_segment_transcript(self, content: str) -> List[TextSegment]:
         """Intelligently segment transcript using multiple approaches"""
-        lines = content.split('\n')
-        segments = []
-        
         # Try explicit marker approach first
-        explicit_segments = self._segment_by_markers(lines)
+        explicit_segments = self._segment_by_markers(content)
         if explicit_segments:
             return explicit_segments
             
         # Fall back to content-based segmentation
-        return self._segment_by_content(lines)
+        return self._segment_by_content(content.split('\n'))
 
-    def _segment_by_markers(self, lines: List[str]) -> List[TextSegment]:
+    def _segment_by_markers(self, content: str) -> List[TextSegment]:
         """Segment using explicit speaker markers"""
         segments = []
-        current_segment = []
         current_speaker = None
         start_line = 0
-        
-        for i, line in enumerate(lines):
-            if not line.strip():
-                if current_segment:
-                    current_segment.append(line)
+        # A segment is the text left on its marker line plus the body of
+        # lines that follow it, up to the next speaker change
+        head = ''
+        body_start = 1
+        line_no = 0
+        counted_to = 1
+        
+        # Only marker lines can change the speaker, so find them with one
+        # scan over the whole transcript; the lines in between are sliced.
+        # A leading newline lets the first line match like the others
+        content = '\n' + content
+        for m in self.line_marker_re.finditer(content):
+            detected_speaker = 'Student' if m.lastgroup == 'student' else 'AI'
+            if detected_speaker == current_speaker:
                 continue
-                
-            detected_speaker = None
-            clean_text = line
-            
-            # Check for speaker markers
-            for pattern in self.explicit_student_markers:
-                if re.match(pattern, line, re.IGNORECASE):
-                    detected_speaker = 'Student'
-                    clean_text = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
-                    break
-                    
-            if not detected_speaker:
-                for pattern in self.explicit_ai_markers:
-                    if re.match(pattern, line, re.IGNORECASE):
-                        detected_speaker = 'AI'
-                        clean_text = re.sub(pattern, '', line, flags=re.IGNORECASE).strip()
-                        break
             
             # Handle speaker changes
-            if detected_speaker and detected_speaker != current_speaker:
-                if current_segment:
-                    segments.append(self._create_segment(current_segment, current_speaker, start_line, i-1))
-                
-                current_segment = [clean_text] if clean_text else []
-                current_speaker = detected_speaker
-                start_line = i
-            else:
-                current_segment.append(line)
+            line_offset = m.start() + 1
+            line_no += content.count('\n', counted_to, line_offset)
+            counted_to = line_offset
+            text = self._segment_text(content, head, body_start, line_offset - 1)
+            if text is not None:
+                segments.append(self._create_segment(text, current_speaker, start_line, line_no - 1))
+            
+            head_end = content.find('\n', m.end())
+            if head_end < 0:
+                head_end = len(content)
+            head = content[m.end():head_end].strip()
+            body_start = head_end + 1
+            current_speaker = detected_speaker
+            start_line = line_no
         
         # Handle final segment
-        if current_segment:
-            segments.append(self._create_segment(current_segment, current_speaker, start_line, len(lines)-1))
+        text = self._segment_text(content, head, body_start, len(content))
+        if text is not None:
+            last_line = line_no + content.count('\n', counted_to)
+            segments.append(self._create_segment(text, current_speaker, start_line, last_line))
             
         return segments
 
+    def _segment_text(self, content: str, head: str, body_start: int, body_end: int) -> Optional[str]:
+        """Join a marker line's text with its body span, or None if both are empty"""
+        if not head:
+            # Leading blank lines are dropped until the segment has content
+            first = self.non_space_re.search(content, body_start, body_end)
+            if not first:
+                return None
+            body_start = max(body_start, content.rfind('\n', body_start, first.start()) + 1)
+            return content[body_start:body_end]
+        if body_start <= body_end:
+            return head + '\n' + content[body_start:body_end]
+        return head
+
     def _segment_by_content(self, lines: List[str]) -> List[TextSegment]:
         """Segment based on content patterns and natural breaks"""
         # Combine lines into larger chunks for analysis
@@ -305,36 +492,11 @@ class AdvancedTranscriptAnalyzer:
         if current_chunk:
             chunks.append('\n'.join(current_chunk))
         
-        # Analyze each chunk
-        segments = []
-        for i, chunk in enumerate(chunks):
-            features = self.extract_features(chunk)
-            speaker, confidence = self.calculate_speaker_probability(chunk, features)
-            
-            segment = TextSegment(
-                text=chunk,
-                speaker_prediction=speaker,
-                confidence=confidence,
-                word_count=features.get('word_count', 0),
-                sentence_count=features.get('sentence_count', 1),
-                avg_sentence_length=features.get('word_count', 0) / max(1, features.get('sentence_count', 1)),
-                reading_level=features.get('flesch_kincaid_grade', 8),
-                technical_score=features.get('has_math', 0) + features.get('has_code', 0),
-                question_count=features.get('question_count', 0),
-                has_math=features.get('has_math', 0) > 0,
-                has_code=features.get('has_code', 0) > 0,
-                formality_score=features.get('formality_score', 0),
-                start_line=i * 10,  # Approximate
-                end_line=(i + 1) * 10,
-                features=features
-            )
-            segments.append(segment)
-            
-        return segments
+        # Analyze each chunk; line numbers are approximate here
+        return [self._create_segment(chunk, None, i * 10, (i + 1) * 10) for i, chunk in enumerate(chunks)]
 
-    def _create_segment(self, lines: List[str], speaker: Optional[str], start_line: int, end_line: int) -> TextSegment:
-        """Create a TextSegment from lines"""
-        text = '\n'.join(lines)
+    def _create_segment(self, text: str, speaker: Optional[str], start_line: int, end_line: int) -> TextSegment:
+        """Create a TextSegment from its text"""
         features = self.extract_features(text)
         
         if speaker:
@@ -343,25 +505,45 @@ class AdvancedTranscriptAnalyzer:
         else:
             predicted_speaker, confidence = self.calculate_speaker_probability(text, features)
         
+        return self._build_segment(text, predicted_speaker, confidence, features, start_line, end_line)
+
+    def _build_segment(self, text: str, speaker: str, confidence: float, features: Optional[np.ndarray],
+                       start_line: int, end_line: int) -> TextSegment:
+        """Create a TextSegment from a prediction and its feature vector"""
+        if features is None:
+            word_count, sentence_count, reading_level = 0, 1, 8
+            has_math = has_code = formality_score = 0.0
+            question_count = 0
+        else:
+            # Read each value out of the vector once, as Python numbers
+            values = features.tolist()
+            word_count = int(values[WORD_COUNT])
+            sentence_count = int(values[SENTENCE_COUNT])
+            reading_level = values[FLESCH_KINCAID_GRADE]
+            has_math = values[HAS_MATH]
+            has_code = values[HAS_CODE]
+            question_count = int(values[QUESTION_COUNT])
+            formality_score = values[FORMALITY_SCORE]
+        
         return TextSegment(
             text=text,
-            speaker_prediction=predicted_speaker,
+            speaker_prediction=speaker,
             confidence=confidence,
-            word_count=features.get('word_count', 0),
-            sentence_count=features.get('sentence_count', 1),
-            avg_sentence_length=features.get('word_count', 0) / max(1, features.get('sentence_count', 1)),
-            reading_level=features.get('flesch_kincaid_grade', 8),
-            technical_score=features.get('has_math', 0) + features.get('has_code', 0),
-            question_count=features.get('question_count', 0),
-            has_math=features.get('has_math', 0) > 0,
-            has_code=features.get('has_code', 0) > 0,
-            formality_score=features.get('formality_score', 0),
+            word_count=word_count,
+            sentence_count=sentence_count,
+            avg_sentence_length=word_count / sentence_count,
+            reading_level=reading_level,
+            technical_score=has_math + has_code,
+            question_count=question_count,
+            has_math=has_math > 0,
+            has_code=has_code > 0,
+            formality_score=formality_score,
             start_line=start_line,
             end_line=end_line,
             features=features
         )
 
-    def analyze_transcript(self, file_path: str) -> TranscriptAnalysis:
+    def analyze_transcript_file(self, file_path: str) -> TranscriptAnalysis:
         """Analyze a complete transcript file"""
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -378,10 +560,16 @@ class AdvancedTranscriptAnalyzer:
                 parsing_method='error',
                 quality_flags=[f'Read error: {e}']
             )
-        
+        return self.analyze_transcript_content(content, Path(file_path).name)
+
+    # Original name, kept for existing callers (the other analyzers use it too)
+    analyze_transcript = analyze_transcript_file
+
+    def analyze_transcript_content(self, content: str, filename: str) -> TranscriptAnalysis:
+        """Analyze transcript text that is already in memory"""
         if not content.strip():
             return TranscriptAnalysis(
-                filename=Path(file_path).name,
+                filename=filename,
                 segments=[],
                 ai_words=0,
                 student_words=0,
@@ -394,13 +582,23 @@ class AdvancedTranscriptAnalyzer:
         
         segments = self.smart_segment_transcript(content)
         
+        # Gather per-segment columns in one pass, then aggregate each with
+        # a single vectorized reduction
+        word_counts = np.empty(len(segments), dtype=np.int32)
+        confidences = np.empty(len(segments), dtype=np.float64)
+        is_student = np.empty(len(segments), dtype=bool)
+        for k, seg in enumerate(segments):
+            word_counts[k] = seg.word_count
+            confidences[k] = seg.confidence
+            is_student[k] = seg.speaker_prediction == 'Student'
+        
         # Calculate statistics
-        ai_words = sum(seg.word_count for seg in segments if seg.speaker_prediction == 'AI')
-        student_words = sum(seg.word_count for seg in segments if seg.speaker_prediction == 'Student')
+        ai_words = int(word_counts[~is_student].sum())
+        student_words = int(word_counts[is_student].sum())
         total_words = ai_words + student_words
         
         student_ratio = student_words / total_words if total_words > 0 else 0.0
-        avg_confidence = np.mean([seg.confidence for seg in segments]) if segments else 0.0
+        avg_confidence = float(confidences.mean()) if segments else 0.0
         
         # Quality assessment
         quality_flags = []
@@ -413,13 +611,13 @@ class AdvancedTranscriptAnalyzer:
         
         # Determine parsing method
         has_explicit_markers = any(
-            re.search(r'^\s*(?:Student|AI|Prof|Assistant):', seg.text, re.IGNORECASE | re.MULTILINE)
+            self.parsing_marker_re.search(seg.text)
             for seg in segments
         )
         parsing_method = 'explicit_markers' if has_explicit_markers else 'content_analysis'
         
         return TranscriptAnalysis(
-            filename=Path(file_path).name,
+            filename=filename,
             segments=segments,
             ai_words=ai_words,
             student_words=student_words,
@@ -427,9 +625,70 @@ class AdvancedTranscriptAnalyzer:
             student_ratio=student_ratio,
             confidence_score=avg_confidence,
             parsing_method=parsing_method,
-            quality_flags=quality_flags
+            quality_flags=quality_flags,
+            segment_word_counts=word_counts,
+            segment_confidences=confidences,
+            segment_is_student=is_student
         )
 
+# Streamlit reruns the whole script on every widget interaction, so the
+# analyses and charts are cached on their inputs
+
+SEGMENTS_PER_PAGE = 10
+
+@st.cache_data(show_spinner=False)
+def _analyze_upload(_analyzer: AdvancedTranscriptAnalyzer, content: bytes, filename: str) -> TranscriptAnalysis:
+    """Analyze one uploaded file, cached on its bytes and name"""
+    return _analyzer.analyze_transcript_content(content.decode('utf-8', errors='ignore'), filename)
+
+# Columns of the per-file CSV export
+EXPORT_COLUMNS = ['Filename', 'Student_Ratio', 'AI_Words', 'Student_Words',
+                  'Total_Words', 'Confidence', 'Parsing_Method', 'Quality_Flags']
+
+def _export_row(a: TranscriptAnalysis) -> tuple:
+    """One transcript's values, in EXPORT_COLUMNS order"""
+    return (a.filename, a.student_ratio, a.ai_words, a.student_words, a.total_words,
+            a.confidence_score, a.parsing_method, '; '.join(a.quality_flags))
+
+@st.cache_data(show_spinner=False)
+def _export_csv(rows: Tuple[tuple, ...]) -> bytes:
+    """Encode export rows as CSV bytes, cached on the rows"""
+    buf = io.BytesIO()
+    pd.DataFrame(list(rows), columns=EXPORT_COLUMNS).to_csv(buf, index=False)
+    return buf.getvalue()
+
+@st.cache_resource(show_spinner=False)
+def _engagement_figure(rows: Tuple[Tuple[str, float, float, int, str], ...]):
+    """Scatter of engagement against length, one (filename, ratio, confidence, words, quality) row per file"""
+    df = pd.DataFrame(list(rows), columns=['filename', 'student_ratio', 'confidence', 'total_words', 'quality'])
+    
+    fig = px.scatter(
+        df, 
+        x='total_words', 
+        y='student_ratio',
+        size='confidence',
+        color='quality',
+        hover_name='filename',
+        title="Student Engagement vs Transcript Length",
+        labels={
+            'student_ratio': 'Student Engagement (%)',
+            'total_words': 'Total Words',
+            'confidence': 'Confidence'
+        }
+    )
+    fig.update_layout(height=500)
+    return fig
+
+@st.cache_resource(show_spinner=False)
+def _word_distribution_figure(distribution: Tuple[Tuple[str, int], ...]):
+    """Pie of words per speaker, from (speaker, words) pairs"""
+    return px.pie(
+        pd.DataFrame(list(distribution), columns=['Speaker', 'Words']),
+        values='Words',
+        names='Speaker',
+        title="Word Distribution"
+    )
+
 def run_streamlit_app():
     """Run the Streamlit web interface"""
     st.set_page_config(page_title="AI-Student Transcript Analyzer", layout="wide")
@@ -454,14 +713,8 @@ def run_streamlit_app():
         # Process files
         progress_bar = st.progress(0)
         for i, uploaded_file in enumerate(uploaded_files):
-            # Save to temp file
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as tmp_file:
-                tmp_file.write(uploaded_file.read().decode('utf-8'))
-                tmp_path = tmp_file.name
-            
-            # Analyze
-            analysis = st.session_state.analyzer.analyze_transcript(tmp_path)
-            analysis.filename = uploaded_file.name  # Use original name
+            # Analyze the upload in memory
+            analysis = _analyze_upload(st.session_state.analyzer, uploaded_file.getvalue(), uploaded_file.name)
             analyses.append(analysis)
             
             progress_bar.progress((i + 1) / len(uploaded_files))
@@ -476,11 +729,11 @@ def run_streamlit_app():
             st.metric("Total Transcripts", len(analyses))
         
         with col2:
-            avg_engagement = np.mean([a.student_ratio for a in analyses])
+            avg_engagement = sum(a.student_ratio for a in analyses) / len(analyses)
             st.metric("Avg Student Engagement", f"{avg_engagement:.1%}")
         
         with col3:
-            avg_confidence = np.mean([a.confidence_score for a in analyses])
+            avg_confidence = sum(a.confidence_score for a in analyses) / len(analyses)
             st.metric("Avg Confidence", f"{avg_confidence:.1%}")
         
         with col4:
@@ -488,29 +741,11 @@ def run_streamlit_app():
             st.metric("Total Words", f"{total_words:,}")
         
         # Engagement distribution chart
-        df = pd.DataFrame([{
-            'filename': a.filename,
-            'student_ratio': a.student_ratio,
-            'confidence': a.confidence_score,
-            'total_words': a.total_words,
-            'quality': 'Good' if not a.quality_flags else 'Needs Review'
-        } for a in analyses])
-        
-        fig = px.scatter(
-            df, 
-            x='total_words', 
-            y='student_ratio',
-            size='confidence',
-            color='quality',
-            hover_name='filename',
-            title="Student Engagement vs Transcript Length",
-            labels={
-                'student_ratio': 'Student Engagement (%)',
-                'total_words': 'Total Words',
-                'confidence': 'Confidence'
-            }
-        )
-        fig.update_layout(height=500)
+        fig = _engagement_figure(tuple(
+            (a.filename, a.student_ratio, a.confidence_score, a.total_words,
+             'Good' if not a.quality_flags else 'Needs Review')
+            for a in analyses
+        ))
         st.plotly_chart(fig, use_container_width=True)
         
         # Detailed transcript view
@@ -533,26 +768,27 @@ def run_streamlit_app():
                     st.warning("Quality Issues: " + ", ".join(analysis.quality_flags))
             
             with col2:
-                # Segment distribution
-                segment_data = pd.DataFrame([{
-                    'Speaker': seg.speaker_prediction,
-                    'Words': seg.word_count,
-                    'Confidence': seg.confidence
-                } for seg in analysis.segments])
-                
-                if not segment_data.empty:
-                    fig = px.pie(
-                        segment_data.groupby('Speaker')['Words'].sum().reset_index(),
-                        values='Words',
-                        names='Speaker',
-                        title="Word Distribution"
-                    )
-                    st.plotly_chart(fig)
+                # Segment distribution: words per speaker that has segments
+                if analysis.segments:
+                    is_student = analysis.segment_is_student
+                    distribution = []
+                    if not is_student.all():
+                        distribution.append(('AI', analysis.ai_words))
+                    if is_student.any():
+                        distribution.append(('Student', analysis.student_words))
+                    st.plotly_chart(_word_distribution_figure(tuple(distribution)))
             
-            # Segment-by-segment view
+            # Segment-by-segment view, a page at a time
             st.subheader("Segment Analysis")
             
-            for i, segment in enumerate(analysis.segments):
+            n_pages = max(1, -(-len(analysis.segments) // SEGMENTS_PER_PAGE))
+            page = 1
+            if n_pages > 1:
+                page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1,
+                                       key=f"segment_page_{selected_file}")
+            first = (page - 1) * SEGMENTS_PER_PAGE
+            
+            for i, segment in enumerate(analysis.segments[first:first + SEGMENTS_PER_PAGE], first):
                 with st.expander(f"Segment {i+1}: {segment.speaker_prediction} ({segment.word_count} words, {segment.confidence:.1%} confidence)"):
                     
                     # Color code by speaker
@@ -568,35 +804,39 @@ def run_streamlit_app():
         st.header("📁 Export Results")
         
         if st.button("Generate CSV Export"):
-            csv_data = pd.DataFrame([{
-                'Filename': a.filename,
-                'Student_Ratio': a.student_ratio,
-                'AI_Words': a.ai_words,
-                'Student_Words': a.student_words,
-                'Total_Words': a.total_words,
-                'Confidence': a.confidence_score,
-                'Parsing_Method': a.parsing_method,
-                'Quality_Flags': '; '.join(a.quality_flags)
-            } for a in analyses])
-            
             st.download_button(
                 label="Download CSV",
-                data=csv_data.to_csv(index=False),
+                data=_export_csv(tuple(_export_row(a) for a in analyses)),
                 file_name="transcript_analysis.csv",
                 mime="text/csv"
             )
 
+_worker_analyzer: Optional[AdvancedTranscriptAnalyzer] = None
+
+def _init_worker():
+    """Create the per-process analyzer used by _analyze_one"""
+    global _worker_analyzer
+    _worker_analyzer = AdvancedTranscriptAnalyzer()
+
+def _analyze_one(file_path: str) -> TranscriptAnalysis:
+    """Analyze one transcript inside a worker process"""
+    return _worker_analyzer.analyze_transcript_file(file_path)
+
 def run_cli(input_dir: str, output_csv: str = "analysis.csv"):
     """Run command-line analysis"""
-    analyzer = AdvancedTranscriptAnalyzer()
-    
     input_path = Path(input_dir)
     if not input_path.exists():
         print(f"Error: Directory {input_dir} does not exist")
         return
     
-    # Find transcript files
-    transcript_files = list(input_path.rglob("*.txt")) + list(input_path.rglob("*.docx"))
+    # Find transcript files in one walk, .txt files first
+    txt_files, docx_files = [], []
+    for path in input_path.rglob("*"):
+        if path.suffix == ".txt":
+            txt_files.append(path)
+        elif path.suffix == ".docx":
+            docx_files.append(path)
+    transcript_files = txt_files + docx_files
     
     if not transcript_files:
         print(f"No transcript files found in {input_dir}")
@@ -604,33 +844,32 @@ def run_cli(input_dir: str, output_csv: str = "analysis.csv"):
     
     print(f"Found {len(transcript_files)} transcript files...")
     
-    analyses = []
-    for file_path in transcript_files:
-        print(f"Analyzing {file_path.name}...")
-        analysis = analyzer.analyze_transcript(str(file_path))
-        analyses.append(analysis)
-        print(f"  → Student: {analysis.student_ratio:.1%}, Confidence: {analysis.confidence_score:.1%}")
-    
-    # Export results
-    df = pd.DataFrame([{
-        'Filename': a.filename,
-        'Student_Ratio': a.student_ratio,
-        'AI_Words': a.ai_words,
-        'Student_Words': a.student_words,
-        'Total_Words': a.total_words,
-        'Confidence': a.confidence_score,
-        'Parsing_Method': a.parsing_method,
-        'Quality_Flags': '; '.join(a.quality_flags)
-    } for a in analyses])
+    # Files are independent, so analyze them in parallel; keep discovery
+    # order in the results so the CSV is stable between runs
+    results = {}
+    with ProcessPoolExecutor(initializer=_init_worker) as executor:
+        futures = {executor.submit(_analyze_one, str(file_path)): i for i, file_path in enumerate(transcript_files)}
+        for future in as_completed(futures):
+            index = futures[future]
+            analysis = future.result()
+            results[index] = analysis
+            print(f"Analyzed {transcript_files[index].name}")
+            print(f"  → Student: {analysis.student_ratio:.1%}, Confidence: {analysis.confidence_score:.1%}")
+    analyses = [results[i] for i in range(len(transcript_files))]
     
-    df.to_csv(output_csv, index=False)
+    # Export results, streamed straight to the file
+    with open(output_csv, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(EXPORT_COLUMNS)
+        writer.writerows(_export_row(a) for a in analyses)
     print(f"\nResults exported to {output_csv}")
     
     # Summary
+    ratios = np.fromiter((a.student_ratio for a in analyses), dtype=np.float64, count=len(analyses))
     print(f"\nSummary:")
-    print(f"Average student engagement: {df['Student_Ratio'].mean():.1%}")
-    print(f"Range: {df['Student_Ratio'].min():.1%} - {df['Student_Ratio'].max():.1%}")
-    print(f"High engagement (>40%): {len(df[df['Student_Ratio'] > 0.4])} files")
+    print(f"Average student engagement: {ratios.mean():.1%}")
+    print(f"Range: {ratios.min():.1%} - {ratios.max():.1%}")
+    print(f"High engagement (>40%): {np.count_nonzero(ratios > 0.4)} files")
 
 if __name__ == "__main__":
     if len(sys.argv) == 1: